@@ -19,6 +19,13 @@ from typing import Dict, List, Optional, Tuple
 import time
 import shutil
 
+# Ускоренная JSON сериализация (опционально)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # Настройка логирования
 logging.basicConfig(
     level=logging.INFO,
@@ -53,10 +60,16 @@ CONFIG = {
     'loudnorm_params': 'loudnorm=I=-23:TP=-2:LRA=7'
 }
 
+# Коды языка, которыми помечаются английские дорожки
+ENGLISH_LANGUAGES = frozenset({'eng', 'en', 'english'})
+
 
 class AudioTrack:
     """Класс для представления аудио дорожки"""
 
+    # Дорожки создаются на каждый поток каждого файла - без __dict__ они легче
+    __slots__ = ('index', 'codec', 'channels', 'language', 'title')
+
     def __init__(self, index: int, codec: str, channels: int, language: str, title: str = None):
         self.index = index
         self.codec = codec
@@ -77,16 +90,26 @@ class AudioTrack:
 class VideoFileProcessor:
     """Основной класс для обработки видеофайлов"""
 
+    # Статусы, которые зависят только от дорожек файла: пока файл не изменился,
+    # повторный анализ через ffprobe даст тот же результат.
+    # 'no_audio' сюда не входит - он же означает и сбой ffprobe.
+    # Каждый статус здесь должен быть ключом статистики в process_directory
+    REUSABLE_STATUSES = frozenset({'no_english'})
+
     def __init__(self, config: Dict):
         self.config = config
         self.state_file = None
         self.state_data = {}
+        # Множество расширений для O(1) проверки при сканировании
+        self.video_extensions = frozenset(ext.lower() for ext in config['video_extensions'])
 
     def load_state(self, directory: Path) -> Dict:
         """Загрузка состояния из технического файла"""
         state_file = directory / self.config['tech_file']
         if state_file.exists():
             try:
+                if ORJSON_AVAILABLE:
+                    return orjson.loads(state_file.read_bytes())
                 with open(state_file, 'r', encoding='utf-8') as f:
                     return json.load(f)
             except Exception as e:
@@ -97,6 +120,10 @@ class VideoFileProcessor:
         """Сохранение состояния в технический файл"""
         state_file = directory / self.config['tech_file']
         try:
+            if ORJSON_AVAILABLE:
+                # orjson сразу пишет UTF-8 байты, как json.dump с ensure_ascii=False
+                state_file.write_bytes(orjson.dumps(state, option=orjson.OPT_INDENT_2))
+                return
             with open(state_file, 'w', encoding='utf-8') as f:
                 json.dump(state, f, indent=2, ensure_ascii=False)
         except Exception as e:
@@ -110,14 +137,15 @@ class VideoFileProcessor:
                 self.config['ffprobe_path'],
                 '-v', 'error',
                 '-print_format', 'json',
-                '-show_streams',
                 '-select_streams', 'a',
+                # Запрашиваем только используемые поля, а не все параметры потока
+                '-show_entries', 'stream=index,codec_name,channels:stream_tags=language,title',
                 str(file_path)
             ]
 
             result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
             if result.returncode == 0:
-                data = json.loads(result.stdout)
+                data = orjson.loads(result.stdout) if ORJSON_AVAILABLE else json.loads(result.stdout)
                 streams = data.get('streams', [])
 
                 for stream in streams:
@@ -144,10 +172,10 @@ class VideoFileProcessor:
         eng_surround = None
 
         for track in tracks:
-            # Проверяем английский язык (eng, en, english)
-            is_english = track.language.lower() in ['eng', 'en', 'english'] or \
-                         'eng' in track.title.lower() or \
-                         'english' in track.title.lower()
+            # Проверяем английский язык (eng, en, english);
+            # 'eng' в названии покрывает и 'english'
+            is_english = track.language.lower() in ENGLISH_LANGUAGES or \
+                         'eng' in track.title.lower()
 
             if is_english:
                 if track.is_stereo() and not eng_stereo:
@@ -155,6 +183,10 @@ class VideoFileProcessor:
                 elif track.is_surround() and not eng_surround:
                     eng_surround = track
 
+                # Обе дорожки найдены - дальше искать незачем
+                if eng_stereo and eng_surround:
+                    break
+
         # Если не нашли по языку, берем первые подходящие дорожки
         if not eng_stereo and not eng_surround:
             for track in tracks:
@@ -252,6 +284,11 @@ class VideoFileProcessor:
         try:
             logger.info(f"Анализируем: {file_path.name}")
 
+            # Отпечаток файла: по нему повторный запуск поймет, что файл не менялся
+            stat = file_path.stat()
+            result['size'] = stat.st_size
+            result['mtime_ns'] = stat.st_mtime_ns
+
             # Получаем информацию о дорожках
             tracks = self.get_audio_tracks(file_path)
             if not tracks:
@@ -302,6 +339,19 @@ class VideoFileProcessor:
 
         return result
 
+    def is_result_current(self, file_path: Path, previous: Dict) -> bool:
+        """Проверка, что сохраненный результат анализа относится к неизмененному файлу"""
+        if previous.get('status') not in self.REUSABLE_STATUSES:
+            return False
+
+        try:
+            stat = file_path.stat()
+        except OSError:
+            return False
+
+        return (previous.get('size') == stat.st_size and
+                previous.get('mtime_ns') == stat.st_mtime_ns)
+
     def scan_directory(self, directory: Path, max_depth: int = 2,
                        current_depth: int = 0) -> List[Path]:
         """Рекурсивное сканирование директории"""
@@ -311,16 +361,18 @@ class VideoFileProcessor:
             return video_files
 
         try:
-            for item in directory.iterdir():
-                if item.is_dir():
-                    # Рекурсивно сканируем поддиректории
-                    video_files.extend(
-                        self.scan_directory(item, max_depth, current_depth + 1)
-                    )
-                elif item.is_file():
-                    # Проверяем расширение файла
-                    if item.suffix.lower() in self.config['video_extensions']:
-                        video_files.append(item)
+            # os.scandir берет тип записи из чтения каталога, без stat на каждый элемент
+            with os.scandir(directory) as it:
+                for entry in it:
+                    if entry.is_dir():
+                        # Рекурсивно сканируем поддиректории
+                        video_files.extend(
+                            self.scan_directory(Path(entry.path), max_depth, current_depth + 1)
+                        )
+                    elif entry.is_file():
+                        # Проверяем расширение файла
+                        if os.path.splitext(entry.name)[1].lower() in self.video_extensions:
+                            video_files.append(Path(entry.path))
 
         except PermissionError:
             logger.warning(f"Нет доступа к директории: {directory}")
@@ -359,6 +411,12 @@ class VideoFileProcessor:
                 stats['has_stereo'] += 1
                 continue
 
+            # Результат анализа неизмененного файла можно использовать повторно
+            if file_key in state and self.is_result_current(file_path, state[file_key]):
+                logger.info(f"[{i}/{stats['total']}] Пропускаем (файл не изменился): {file_path.name}")
+                stats[state[file_key]['status']] += 1
+                continue
+
             logger.info(f"[{i}/{stats['total']}] Обрабатываем: {file_path.name}")
 
             # Обрабатываем файл
@@ -1,6 +1,7 @@
 import os
 import sys
 import json
+import time
 import asyncio
 from pathlib import Path
 from datetime import datetime, timedelta
@@ -10,14 +11,25 @@ from .telegram_notifier import TelegramNotifier
 from .config_manager import ConfigManager
 from .download_monitor import DownloadMonitor, DownloadStatus, FileDownloadInfo
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 class AudioMonitor:
     """Основной класс мониторинга"""
 
     def __init__(self, config: ConfigManager):
         self.config = config
         self.running = False
+        # Событие остановки создается в monitor_loop (привязано к его event loop)
+        self._stop_event = None
+        self._loop = None
         self.notifier = None
         self.processed_files = set()
+        # Ограничение параллельных запусков ffprobe при анализе файлов
+        self._ffprobe_semaphore = asyncio.Semaphore(os.cpu_count() or 4)
         self.stats = {
             'total_processed': 0,
             'converted': 0,
@@ -52,15 +64,18 @@ class AudioMonitor:
     def find_new_files(self, directory: Path) -> List[Path]:
         """Поиск новых видеофайлов"""
         new_files = []
-        extensions = self.config.get('FileTypes', 'extensions', '.mp4,.mkv').split(',')
+        extensions = frozenset(
+            ext.strip().lower() for ext in self.config.get('FileTypes', 'extensions', '.mp4,.mkv').split(',')
+        )
         min_size_mb = self.config.getint('Advanced', 'min_file_size_mb', 100)
         min_size_bytes = min_size_mb * 1024 * 1024
         ignore_days = self.config.getint('Advanced', 'ignore_older_than_days', 0)
+        max_depth = self.config.getint('General', 'max_depth', 2)
         
-        logger.info(f"Поиск файлов в: {directory}")
-        logger.info(f"Расширения: {extensions}")
-        logger.info(f"Минимальный размер: {min_size_mb} МБ")
-        logger.info(f"Игнорировать старше: {ignore_days} дней")
+        logger.info("Поиск файлов в: %s", directory)
+        logger.info("Расширения: %s", ', '.join(sorted(extensions)))
+        logger.info("Минимальный размер: %s МБ", min_size_mb)
+        logger.info("Игнорировать старше: %s дней", ignore_days)
 
         # Определяем минимальную дату модификации
         if ignore_days > 0:
@@ -69,60 +84,67 @@ class AudioMonitor:
             min_date = None
 
         def scan_dir(path: Path, depth: int = 0):
-            max_depth = self.config.getint('General', 'max_depth', 2)
             if depth > max_depth:
-                logger.debug(f"Достигнута максимальная глубина {max_depth} для: {path}")
+                logger.debug("Достигнута максимальная глубина %s для: %s", max_depth, path)
                 return
 
             try:
-                logger.info(f"Сканируем директорию (глубина {depth}): {path}")
-                items = list(path.iterdir())
-                logger.info(f"Найдено элементов: {len(items)}")
-                
-                for item in items:
-                    if item.is_dir():
-                        logger.debug(f"Найдена поддиректория: {item.name}")
-                        scan_dir(item, depth + 1)
-                    elif item.is_file():
-                        logger.debug(f"Найден файл: {item.name} ({item.suffix.lower()})")
-                        
+                logger.info("Сканируем директорию (глубина %s): %s", depth, path)
+                # os.scandir отдает тип записи без отдельного stat на каждый элемент
+                with os.scandir(path) as it:
+                    entries = list(it)
+                logger.info("Найдено элементов: %s", len(entries))
+
+                for entry in entries:
+                    if entry.is_dir():
+                        logger.debug("Найдена поддиректория: %s", entry.name)
+                        scan_dir(Path(entry.path), depth + 1)
+                    elif entry.is_file():
+                        suffix = os.path.splitext(entry.name)[1].lower()
+                        logger.debug("Найден файл: %s (%s)", entry.name, suffix)
+
                         # Проверяем расширение
-                        if item.suffix.lower() not in extensions:
-                            logger.debug(f"Пропускаем файл (неподходящее расширение): {item.name}")
+                        if suffix not in extensions:
+                            logger.debug("Пропускаем файл (неподходящее расширение): %s", entry.name)
                             continue
 
+                        # Один stat на файл для размера и даты модификации
+                        stat = entry.stat()
+
                         # Проверяем размер
-                        file_size_mb = item.stat().st_size / (1024 * 1024)
-                        if item.stat().st_size < min_size_bytes:
-                            logger.debug(f"Пропускаем файл (маленький размер {file_size_mb:.1f} МБ): {item.name}")
+                        file_size_mb = stat.st_size / (1024 * 1024)
+                        if stat.st_size < min_size_bytes:
+                            logger.debug("Пропускаем файл (маленький размер %.1f МБ): %s", file_size_mb, entry.name)
                             continue
 
                         # Проверяем дату модификации
                         if min_date:
-                            mtime = datetime.fromtimestamp(item.stat().st_mtime)
+                            mtime = datetime.fromtimestamp(stat.st_mtime)
                             if mtime < min_date:
-                                logger.debug(f"Пропускаем файл (старый): {item.name}")
+                                logger.debug("Пропускаем файл (старый): %s", entry.name)
                                 continue
 
-                        # Проверяем, не обработан ли файл ранее
-                        if str(item) not in self.processed_files:
+                        # Проверяем, не обработан ли файл ранее. entry.path уже
+                        # совпадает с str(Path(...)), Path строим только для новых файлов
+                        if entry.path not in self.processed_files:
+                            item = Path(entry.path)
                             # Проверяем статус загрузки файла
                             download_info = self.download_monitor.get_file_status(item)
                             if download_info is None:
                                 # Добавляем файл в мониторинг загрузок
                                 download_info = self.download_monitor.add_file(item, is_torrent_file=True)
-                                logger.info(f"Добавлен в мониторинг загрузок: {item.name}")
+                                logger.info("Добавлен в мониторинг загрузок: %s", item.name)
                             
                             # Проверяем завершена ли загрузка
                             if download_info.status == DownloadStatus.COMPLETED:
-                                logger.info(f"Найден новый файл для обработки: {item.name} ({file_size_mb:.1f} МБ)")
+                                logger.info("Найден новый файл для обработки: %s (%.1f МБ)", item.name, file_size_mb)
                                 new_files.append(item)
                             elif download_info.status == DownloadStatus.DOWNLOADING:
-                                logger.info(f"Файл еще загружается: {item.name} ({download_info.detection_method})")
+                                logger.info("Файл еще загружается: %s (%s)", item.name, download_info.detection_method)
                             else:
-                                logger.debug(f"Файл в статусе {download_info.status.value}: {item.name}")
+                                logger.debug("Файл в статусе %s: %s", download_info.status.value, item.name)
                         else:
-                            logger.debug(f"Файл уже обработан: {item.name}")
+                            logger.debug("Файл уже обработан: %s", entry.name)
             except PermissionError:
                 logger.warning(f"Нет доступа к: {path}")
             except Exception as e:
@@ -136,23 +158,35 @@ class AudioMonitor:
         history_file = Path('processed_files.json')
         if history_file.exists():
             try:
-                with open(history_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    self.processed_files = set(data.get('files', []))
-                    self.stats = data.get('stats', self.stats)
-                logger.info(f"Загружена история: {len(self.processed_files)} файлов")
+                if ORJSON_AVAILABLE:
+                    data = orjson.loads(history_file.read_bytes())
+                else:
+                    with open(history_file, 'r', encoding='utf-8') as f:
+                        data = json.load(f)
+                self.processed_files = set(data.get('files', []))
+                self.stats = data.get('stats', self.stats)
+                logger.info("Загружена история: %s файлов", len(self.processed_files))
             except Exception as e:
                 logger.error(f"Ошибка загрузки истории: {e}")
 
-    def save_processed_files(self):
-        """Сохранение списка обработанных файлов"""
+    async def save_processed_files(self):
+        """Сохранение списка обработанных файлов без блокировки event loop"""
+        # Снимок (копии) собираем в event loop, запись на диск - в рабочем потоке
+        data = {
+            'files': list(self.processed_files),
+            'stats': dict(self.stats),
+            'last_update': datetime.now().isoformat()
+        }
+        await asyncio.to_thread(self._write_history, data)
+
+    def _write_history(self, data: Dict):
+        """Запись снимка истории в processed_files.json"""
         history_file = Path('processed_files.json')
         try:
-            data = {
-                'files': list(self.processed_files),
-                'stats': self.stats,
-                'last_update': datetime.now().isoformat()
-            }
+            if ORJSON_AVAILABLE:
+                # История растет с каждым файлом - orjson заметно быстрее json.dump
+                history_file.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+                return
             with open(history_file, 'w', encoding='utf-8') as f:
                 json.dump(data, f, indent=2, ensure_ascii=False)
         except Exception as e:
@@ -168,7 +202,7 @@ class AudioMonitor:
         }
 
         try:
-            logger.info(f"Начинаем обработку: {file_path.name}")
+            logger.info("Начинаем обработку: %s", file_path.name)
             
             # Анализируем файл и отправляем уведомление о начале обработки
             if self.notifier and self.config.getboolean('Telegram', 'notify_on_processing'):
@@ -187,7 +221,7 @@ class AudioMonitor:
                 delete_flag
             ]))  # Убираем пустые элементы
 
-            logger.info(f"Запускаем конвертацию: {file_path.name}")
+            logger.info("Запускаем конвертацию: %s", file_path.name)
 
             process = await asyncio.create_subprocess_exec(
                 *cmd,
@@ -248,7 +282,7 @@ class AudioMonitor:
         # Добавляем в обработанные
         self.processed_files.add(str(file_path))
         self.stats['total_processed'] += 1
-        self.save_processed_files()
+        await self.save_processed_files()
 
         # Удаляем файл из мониторинга загрузок после обработки
         self.download_monitor.remove_file(file_path)
@@ -258,9 +292,6 @@ class AudioMonitor:
     async def analyze_file_info(self, file_path: Path) -> Dict:
         """Анализ информации о файле для уведомления"""
         try:
-            import subprocess
-            import json
-            
             # Используем ffprobe для получения информации о файле
             cmd = [
                 'ffprobe',
@@ -271,13 +302,26 @@ class AudioMonitor:
                 str(file_path)
             ]
             
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
+            # Асинхронный запуск не блокирует event loop, семафор ограничивает
+            # число одновременно работающих ffprobe
+            async with self._ffprobe_semaphore:
+                process = await asyncio.create_subprocess_exec(
+                    *cmd,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE
+                )
+                try:
+                    stdout, _ = await asyncio.wait_for(process.communicate(), timeout=30)
+                except asyncio.TimeoutError:
+                    process.kill()
+                    await process.wait()
+                    raise
             
-            if result.returncode != 0:
+            if process.returncode != 0:
                 logger.warning(f"Не удалось проанализировать файл {file_path.name}")
                 return self._get_basic_file_info(file_path)
             
-            data = json.loads(result.stdout)
+            data = json.loads(stdout)
             
             # Извлекаем информацию о файле
             file_info = {
@@ -312,16 +356,17 @@ class AudioMonitor:
                     # Извлекаем язык из тегов
                     tags = stream.get('tags', {})
                     for key, value in tags.items():
-                        if key.lower() in ['language', 'lang']:
+                        if key.lower() in ('language', 'lang'):
                             track['language'] = value.lower()
                             break
                     
                     # Если язык не найден, пробуем другие поля
                     if track['language'] == 'unknown':
                         title = tags.get('title', '').lower()
-                        if 'english' in title or 'eng' in title:
+                        # 'eng'/'rus' покрывают и полные названия языков
+                        if 'eng' in title:
                             track['language'] = 'eng'
-                        elif 'russian' in title or 'rus' in title:
+                        elif 'rus' in title:
                             track['language'] = 'rus'
                     
                     file_info['audio_tracks'].append(track)
@@ -347,33 +392,41 @@ class AudioMonitor:
         try:
             # Сканируем директорию для получения актуальной информации
             all_files = []
-            extensions = self.config.get('FileTypes', 'extensions', '.mp4,.mkv').split(',')
+            extensions = frozenset(
+                ext.strip().lower() for ext in self.config.get('FileTypes', 'extensions', '.mp4,.mkv').split(',')
+            )
             min_size_mb = self.config.getint('Advanced', 'min_file_size_mb', 100)
             min_size_bytes = min_size_mb * 1024 * 1024
+            max_depth = self.config.getint('General', 'max_depth', 2)
             
             def scan_for_startup(path: Path, depth: int = 0):
-                max_depth = self.config.getint('General', 'max_depth', 2)
                 if depth > max_depth:
                     return
                 
                 try:
-                    for item in path.iterdir():
-                        if item.is_dir():
-                            scan_for_startup(item, depth + 1)
-                        elif item.is_file():
-                            if (item.suffix.lower() in extensions and 
-                                item.stat().st_size >= min_size_bytes):
+                    # os.scandir отдает тип записи из чтения директории,
+                    # stat делаем один раз и только для подходящих файлов
+                    with os.scandir(path) as it:
+                        for entry in it:
+                            if entry.is_dir():
+                                scan_for_startup(Path(entry.path), depth + 1)
+                            elif entry.is_file():
+                                if os.path.splitext(entry.name)[1].lower() not in extensions:
+                                    continue
+                                size = entry.stat().st_size
+                                if size < min_size_bytes:
+                                    continue
                                 
                                 # Определяем статус файла
-                                if str(item) in self.processed_files:
+                                if entry.path in self.processed_files:
                                     status = 'processed'
                                 else:
                                     status = 'pending'
                                 
                                 all_files.append({
-                                    'name': item.name,
+                                    'name': entry.name,
                                     'status': status,
-                                    'size': item.stat().st_size
+                                    'size': size
                                 })
                 except (PermissionError, OSError):
                     pass
@@ -381,8 +434,9 @@ class AudioMonitor:
             scan_for_startup(watch_dir)
             
             # Подсчитываем статистику
-            processed_count = len([f for f in all_files if f['status'] == 'processed'])
-            pending_count = len([f for f in all_files if f['status'] == 'pending'])
+            # Статусов только два, поэтому ожидающие - это все остальные
+            processed_count = sum(1 for f in all_files if f['status'] == 'processed')
+            pending_count = len(all_files) - processed_count
             
             # Подготавливаем данные для визуальной карточки
             startup_info = {
@@ -439,20 +493,27 @@ class AudioMonitor:
             await self.send_startup_notification(watch_dir, check_interval)
 
         self.running = True
-        last_summary_time = datetime.now()
-        last_check_time = datetime.now() - timedelta(seconds=check_interval)  # Принудительная проверка при запуске
+        self._loop = asyncio.get_running_loop()
+        self._stop_event = asyncio.Event()
+        # Интервалы считаем по монотонным часам: это дешевле datetime.now()
+        # и не ломается при переводе системного времени
+        last_summary_time = time.monotonic()
+        last_check_time = last_summary_time - check_interval  # Принудительная проверка при запуске
 
         while self.running:
             try:
-                current_time = datetime.now()
+                current_time = time.monotonic()
                 
                 # Отправляем отложенные уведомления о завершении загрузок
                 await self._send_pending_download_notifications()
                 
                 # Проверяем, пора ли сканировать файлы
-                if (current_time - last_check_time).total_seconds() >= check_interval:
-                    # Ищем новые файлы
-                    new_files = self.find_new_files(watch_dir)
+                if current_time - last_check_time >= check_interval:
+                    # Ищем новые файлы. Обход директорий и проверки загрузок -
+                    # блокирующий I/O, поэтому уводим его в рабочий поток, чтобы
+                    # не останавливать event loop (отложенные уведомления при этом
+                    # попадают в очередь _pending_download_notifications)
+                    new_files = await asyncio.to_thread(self.find_new_files, watch_dir)
 
                     if new_files:
                         logger.info(f"Найдено новых файлов: {len(new_files)}")
@@ -462,11 +523,9 @@ class AudioMonitor:
                                 break
 
                             await self.process_file(file_path)
-                            # Короткая пауза между файлами с проверкой флага
-                            for _ in range(20):  # 2 секунды = 20 * 0.1
-                                if not self.running:
-                                    break
-                                await asyncio.sleep(0.1)
+                            # Короткая пауза между файлами, прерываемая остановкой
+                            if await self._wait_for_stop(2):
+                                break
                     else:
                         logger.info("Новых файлов для обработки не найдено")
                     
@@ -474,20 +533,25 @@ class AudioMonitor:
 
                 # Отправляем сводку раз в час
                 if self.notifier and self.config.getboolean('Telegram', 'notify_summary'):
-                    if (current_time - last_summary_time).total_seconds() >= 3600:
+                    if current_time - last_summary_time >= 3600:
                         await self.send_summary()
                         last_summary_time = current_time
 
-                # Короткий sleep с частой проверкой флага остановки
-                await asyncio.sleep(1)  # Проверяем каждую секунду
+                # Тик раз в секунду; stop() будит цикл сразу
+                await self._wait_for_stop(1)
 
             except Exception as e:
                 logger.error(f"Ошибка в цикле мониторинга: {e}")
-                # Короткая пауза при ошибке с проверкой флага
-                for _ in range(30):  # 30 секунд = 30 * 1
-                    if not self.running:
-                        break
-                    await asyncio.sleep(1)
+                # Пауза при ошибке, прерываемая остановкой
+                await self._wait_for_stop(30)
+
+    async def _wait_for_stop(self, timeout: float) -> bool:
+        """Ожидание остановки не дольше timeout секунд. True - если мониторинг остановлен"""
+        try:
+            await asyncio.wait_for(self._stop_event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        return not self.running
 
     async def send_summary(self):
         """Отправка визуальной сводки в Telegram"""
@@ -583,6 +647,15 @@ class AudioMonitor:
         logger.info("Останавливаем мониторинг...")
         self.running = False
         
+        # stop() вызывается и из других потоков (служба Windows, сигналы),
+        # поэтому событие выставляем через call_soon_threadsafe
+        if self._loop is not None and self._stop_event is not None:
+            try:
+                self._loop.call_soon_threadsafe(self._stop_event.set)
+            except RuntimeError:
+                # Event loop уже закрыт - ждать некому
+                pass
+        
         # Останавливаем мониторинг загрузок
         if hasattr(self, 'download_monitor'):
             self.download_monitor.stop_monitoring()
@@ -149,12 +149,18 @@ cleanup_completed_hours = 24
                         existing_config.set(section_name, option, value)
                         logger.debug(f"Добавлена опция: {section_name}.{option} = {value}")
                 else:
-                    # Проверяем отсутствующие опции в существующей секции
+                    # Отсутствующие опции находим разностью множеств, а не
+                    # has_option() на каждую; порядок берем из DEFAULT_CONFIG
+                    missing = set(default_config.options(section_name)).difference(
+                        existing_config.options(section_name)
+                    )
+                    if not missing:
+                        continue
                     for option, value in default_config.items(section_name):
-                        if not existing_config.has_option(section_name, option):
+                        if option in missing:
                             logger.info(f"Добавляем новую опцию: {section_name}.{option}")
                             existing_config.set(section_name, option, value)
-                            needs_update = True
+                    needs_update = True
             
             # Сохраняем обновленный конфиг если были изменения
             if needs_update:
@@ -19,7 +19,7 @@ from .video_integrity_checker import is_video_file_complete
 logger = logging.getLogger(__name__)
 
 
-class DownloadStatus(Enum):
+class DownloadStatus(str, Enum):
     """File download status enumeration"""
     UNKNOWN = "unknown"
     DOWNLOADING = "downloading"
@@ -28,7 +28,7 @@ class DownloadStatus(Enum):
     PAUSED = "paused"
 
 
-@dataclass
+@dataclass(slots=True)
 class FileDownloadInfo:
     """Information about a file's download status"""
     file_path: Path
@@ -67,6 +67,18 @@ class DownloadMonitor:
         '.temp',     # Temporary
     }
     
+    # Video extensions eligible for FFmpeg integrity check
+    VIDEO_EXTENSIONS = frozenset({
+        '.mkv', '.mp4', '.avi', '.mov', '.wmv', '.flv', '.m4v', '.webm'
+    })
+    
+    # Common video file header signatures
+    VIDEO_SIGNATURES = (
+        b'\x1a\x45\xdf\xa3',  # Matroska/MKV
+        b'ftyp',              # MP4
+        b'RIFF',              # AVI
+    )
+    
     # Minimum time (seconds) file must be stable to consider complete
     STABILITY_THRESHOLD = 60.0  # Increased from 30 to 60 seconds for better detection
     
@@ -95,10 +107,15 @@ class DownloadMonitor:
             except Exception as e:
                 logger.error(f"Error in download monitor callback: {e}")
                 
+    @staticmethod
+    def _make_key(file_path: str | Path) -> str:
+        """Build monitored_files key (pure string op, no Path round-trip)"""
+        return os.path.abspath(os.fspath(file_path))
+        
     def add_file(self, file_path: str | Path, is_torrent_file: bool = True) -> FileDownloadInfo:
         """Add file to monitoring list"""
+        key = self._make_key(file_path)
         file_path = Path(file_path)
-        key = str(file_path.absolute())
         
         with self._lock:
             if key not in self.monitored_files:
@@ -117,7 +134,7 @@ class DownloadMonitor:
         
     def remove_file(self, file_path: str | Path):
         """Remove file from monitoring list"""
-        key = str(Path(file_path).absolute())
+        key = self._make_key(file_path)
         with self._lock:
             if key in self.monitored_files:
                 del self.monitored_files[key]
@@ -125,7 +142,7 @@ class DownloadMonitor:
                 
     def get_file_status(self, file_path: str | Path) -> Optional[FileDownloadInfo]:
         """Get current status of monitored file"""
-        key = str(Path(file_path).absolute())
+        key = self._make_key(file_path)
         with self._lock:
             return self.monitored_files.get(key)
             
@@ -154,8 +171,14 @@ class DownloadMonitor:
         """Detect download status using multiple methods"""
         file_path = file_info.file_path
         
-        # Method 1: Check if file exists
-        if not file_path.exists():
+        # Method 1: Check if file exists. The stat result is reused for the
+        # size/mtime update below instead of exists() followed by stat()
+        try:
+            file_stat = os.stat(file_path)
+        except OSError:
+            file_stat = None
+            
+        if file_stat is None:
             # Check for incomplete versions
             incomplete_path = self._find_incomplete_file(file_path)
             if incomplete_path:
@@ -169,24 +192,24 @@ class DownloadMonitor:
         # Method 2: Check file extension for incomplete markers
         if file_path.suffix.lower() in self.INCOMPLETE_EXTENSIONS:
             file_info.detection_method = f"incomplete_extension: {file_path.suffix}"
-            self._update_file_stats(file_info, file_path)
+            self._update_file_stats(file_info, file_path, file_stat)
             return DownloadStatus.DOWNLOADING
             
         # Method 3: Check if file is locked/being written to
         if self._is_file_locked(file_path):
             file_info.detection_method = "file_locked"
-            self._update_file_stats(file_info, file_path)
+            self._update_file_stats(file_info, file_path, file_stat)
             return DownloadStatus.DOWNLOADING
             
         # Method 4: Check for torrent-specific indicators
         torrent_status = self._check_torrent_indicators(file_path)
         if torrent_status != DownloadStatus.UNKNOWN:
-            self._update_file_stats(file_info, file_path)
+            self._update_file_stats(file_info, file_path, file_stat)
             file_info.detection_method = f"torrent_indicator: {torrent_status.value}"
             return torrent_status
             
         # Method 5: Check file size stability
-        self._update_file_stats(file_info, file_path)
+        self._update_file_stats(file_info, file_path, file_stat)
         
         if file_info.stable_duration < self.stability_threshold:
             file_info.detection_method = f"size_unstable: {file_info.stable_duration:.1f}s"
@@ -207,16 +230,20 @@ class DownloadMonitor:
         parent = target_path.parent
         stem = target_path.stem
         
+        # List the directory once instead of two exists() calls per extension.
+        # normcase keeps the lookup case-insensitive on Windows, like exists()
+        try:
+            names = {os.path.normcase(name): name for name in os.listdir(parent)}
+        except OSError:
+            return None
+        
         for ext in self.INCOMPLETE_EXTENSIONS:
-            # Check for filename.ext.incomplete_ext
-            incomplete_path = parent / f"{target_path.name}{ext}"
-            if incomplete_path.exists():
-                return incomplete_path
-                
-            # Check for filename.incomplete_ext (without original extension)
-            incomplete_path = parent / f"{stem}{ext}"
-            if incomplete_path.exists():
-                return incomplete_path
+            # Check for filename.ext.incomplete_ext, then
+            # filename.incomplete_ext (without original extension)
+            for candidate in (f"{target_path.name}{ext}", f"{stem}{ext}"):
+                name = names.get(os.path.normcase(candidate))
+                if name is not None:
+                    return parent / name
                 
         return None
         
@@ -232,21 +259,24 @@ class DownloadMonitor:
         except Exception:
             return False
             
-    def _update_file_stats(self, file_info: FileDownloadInfo, actual_path: Path):
+    def _update_file_stats(self, file_info: FileDownloadInfo, actual_path: Path,
+                           stat: Optional[os.stat_result] = None):
         """Update file statistics (size, modification time, stability)"""
         try:
-            stat = actual_path.stat()
+            if stat is None:
+                stat = actual_path.stat()
             new_size = stat.st_size
             new_mtime = datetime.fromtimestamp(stat.st_mtime)
+            now = datetime.now()
             
             # Check if size changed
             if new_size != file_info.size:
                 file_info.size = new_size
-                file_info.last_size_change = datetime.now()
+                file_info.last_size_change = now
                 file_info.stable_duration = 0.0
             else:
                 # Calculate stability duration
-                file_info.stable_duration = (datetime.now() - file_info.last_size_change).total_seconds()
+                file_info.stable_duration = (now - file_info.last_size_change).total_seconds()
                 
             file_info.last_modified = new_mtime
             
@@ -259,11 +289,17 @@ class DownloadMonitor:
             parent_dir = file_path.parent
             file_stem = file_path.stem
             
-            # Check for .torrent files in the same directory
-            torrent_files = list(parent_dir.glob("*.torrent"))
-            if torrent_files:
-                # If there are .torrent files, this might be an active download
-                logger.debug(f"Found {len(torrent_files)} torrent files in {parent_dir}")
+            # Read the directory once; all checks below match against these
+            # names instead of issuing an exists()/glob per pattern.
+            # normcase keeps matching case-insensitive on Windows
+            names = [os.path.normcase(name) for name in os.listdir(parent_dir)]
+            
+            # Check for .torrent files in the same directory (informational only)
+            if logger.isEnabledFor(logging.DEBUG):
+                torrent_count = sum(1 for name in names if name.endswith(".torrent"))
+                if torrent_count:
+                    # If there are .torrent files, this might be an active download
+                    logger.debug("Found %s torrent files in %s", torrent_count, parent_dir)
             
             # Check for common torrent client lock files or temp files
             lock_patterns = [
@@ -276,27 +312,29 @@ class DownloadMonitor:
                 "fastresume",  # qBittorrent
             ]
             
+            name_set = set(names)
             for pattern in lock_patterns:
-                if (parent_dir / pattern).exists():
-                    logger.debug(f"Found torrent indicator file: {pattern}")
+                if os.path.normcase(pattern) in name_set:
+                    logger.debug("Found torrent indicator file: %s", pattern)
                     return DownloadStatus.DOWNLOADING
             
             # Check for incomplete file patterns in the same directory
-            incomplete_patterns = [
-                f"{file_stem}.*",
-                f"{file_path.name}.*"
-            ]
+            # (equivalent to globbing "<stem>.*" and "<name>.*")
+            prefixes = (
+                os.path.normcase(f"{file_stem}."),
+                os.path.normcase(f"{file_path.name}.")
+            )
             
-            for pattern in incomplete_patterns:
-                for incomplete_file in parent_dir.glob(pattern):
-                    if incomplete_file.suffix.lower() in self.INCOMPLETE_EXTENSIONS:
-                        logger.debug(f"Found related incomplete file: {incomplete_file.name}")
-                        return DownloadStatus.DOWNLOADING
+            for name in names:
+                if (name.startswith(prefixes) and
+                        os.path.splitext(name)[1].lower() in self.INCOMPLETE_EXTENSIONS):
+                    logger.debug("Found related incomplete file: %s", name)
+                    return DownloadStatus.DOWNLOADING
             
             return DownloadStatus.UNKNOWN
             
         except Exception as e:
-            logger.debug(f"Error checking torrent indicators for {file_path}: {e}")
+            logger.debug("Error checking torrent indicators for %s: %s", file_path, e)
             return DownloadStatus.UNKNOWN
     
     def _check_file_completion(self, file_info: FileDownloadInfo) -> DownloadStatus:
@@ -306,36 +344,36 @@ class DownloadMonitor:
             
             # Check 1: File size reasonableness (should be > 10MB for video files)
             if file_info.current_size < 10 * 1024 * 1024:  # 10MB
-                logger.debug(f"File size too small: {file_info.current_size} bytes")
+                logger.debug("File size too small: %s bytes", file_info.current_size)
                 return DownloadStatus.DOWNLOADING
                 
             # Check 2: Recent modification time (modified within last 2 minutes = likely downloading)
             if file_info.last_modified:
                 time_since_modified = time.time() - file_info.last_modified
                 if time_since_modified < 120:  # 2 minutes
-                    logger.debug(f"File recently modified: {time_since_modified:.1f}s ago")
+                    logger.debug("File recently modified: %.1fs ago", time_since_modified)
                     return DownloadStatus.DOWNLOADING
                     
             # Check 3: Video file integrity check using FFmpeg
-            if file_path.suffix.lower() in ['.mkv', '.mp4', '.avi', '.mov', '.wmv', '.flv', '.m4v', '.webm']:
+            if file_path.suffix.lower() in self.VIDEO_EXTENSIONS:
                 try:
                     is_complete, reason = is_video_file_complete(file_path)
                     if not is_complete:
-                        logger.debug(f"Video integrity check failed: {reason}")
+                        logger.debug("Video integrity check failed: %s", reason)
                         return DownloadStatus.DOWNLOADING
                     else:
-                        logger.debug(f"Video integrity check passed: {reason}")
+                        logger.debug("Video integrity check passed: %s", reason)
                         return DownloadStatus.COMPLETED
                         
                 except Exception as e:
-                    logger.debug(f"Video integrity check error: {e}")
+                    logger.debug("Video integrity check error: %s", e)
                     # Fallback to basic header check if FFmpeg fails
                     return self._check_video_header(file_path)
             
             return DownloadStatus.UNKNOWN
             
         except Exception as e:
-            logger.debug(f"Error in completion check for {file_info.file_path}: {e}")
+            logger.debug("Error in completion check for %s: %s", file_info.file_path, e)
             return DownloadStatus.UNKNOWN
     
     def _check_video_header(self, file_path: Path) -> DownloadStatus:
@@ -348,19 +386,13 @@ class DownloadMonitor:
                     return DownloadStatus.DOWNLOADING
                 
                 # Check for common video file signatures
-                video_signatures = [
-                    b'\x1a\x45\xdf\xa3',  # Matroska/MKV
-                    b'ftyp',              # MP4
-                    b'RIFF',              # AVI
-                ]
-                
-                has_valid_signature = any(sig in header for sig in video_signatures)
+                has_valid_signature = any(sig in header for sig in self.VIDEO_SIGNATURES)
                 if not has_valid_signature:
                     logger.debug("No valid video signature found")
                     return DownloadStatus.DOWNLOADING
                     
         except Exception as e:
-            logger.debug(f"Could not verify file header: {e}")
+            logger.debug("Could not verify file header: %s", e)
             # If we can't read the file, it might still be downloading
             return DownloadStatus.DOWNLOADING
             
@@ -437,12 +469,16 @@ class DownloadMonitor:
 
 # Convenience functions for easy integration
 _global_monitor = None
+_global_monitor_lock = threading.Lock()
 
 def get_global_monitor() -> DownloadMonitor:
     """Get or create global download monitor instance"""
     global _global_monitor
+    # Double-checked locking: no lock on the fast path once created
     if _global_monitor is None:
-        _global_monitor = DownloadMonitor()
+        with _global_monitor_lock:
+            if _global_monitor is None:
+                _global_monitor = DownloadMonitor()
     return _global_monitor
 
 def monitor_file(file_path: str | Path, is_torrent_file: bool = True) -> FileDownloadInfo:
@@ -14,6 +14,7 @@
 """
 from __future__ import annotations
 
+import time
 from pathlib import Path
 from typing import Dict, Optional
 from datetime import datetime
@@ -94,7 +95,7 @@ class HtmlVisualGenerator:
     def cleanup_temp_files(self, max_age_hours: int = 24) -> None:
         """Удаляет старые PNG из временной папки."""
         try:
-            now = datetime.now().timestamp()
+            now = time.time()
             threshold = max_age_hours * 3600
             for p in self.temp_dir.glob("*.png"):
                 age = now - p.stat().st_mtime
@@ -1,12 +1,19 @@
 import logging
 import sys
+import threading
+
+# Защищает установку handlers при одновременном вызове из разных потоков
+_setup_lock = threading.Lock()
 
 def setup_logger(name: str = __name__, log_file: str = 'audio_monitor.log'):
     """Настройка логгера для модуля"""
     logger = logging.getLogger(name)
     
     # Избегаем дублирования handlers
-    if not logger.handlers:
+    with _setup_lock:
+        if logger.handlers:
+            return logger
+
         logger.setLevel(logging.INFO)
         
         # Форматтер
@@ -5,9 +5,12 @@ Video Integrity Checker Module
 Особенно полезно для торрент-загрузок, где файл может быть частично доступен.
 """
 
+import os
 import subprocess
 import json
 import logging
+import threading
+from collections import OrderedDict
 from pathlib import Path
 from typing import Dict, Optional, Tuple
 from dataclasses import dataclass
@@ -16,7 +19,7 @@ from enum import Enum
 logger = logging.getLogger(__name__)
 
 
-class VideoIntegrityStatus(Enum):
+class VideoIntegrityStatus(str, Enum):
     """Статус целостности видеофайла"""
     COMPLETE = "complete"
     INCOMPLETE = "incomplete" 
@@ -25,7 +28,7 @@ class VideoIntegrityStatus(Enum):
     UNKNOWN = "unknown"
 
 
-@dataclass
+@dataclass(slots=True)
 class VideoIntegrityInfo:
     """Информация о целостности видеофайла"""
     status: VideoIntegrityStatus
@@ -44,19 +47,26 @@ class VideoIntegrityInfo:
 class VideoIntegrityChecker:
     """Проверка целостности видеофайлов с помощью FFmpeg"""
     
+    # Сколько результатов ffprobe держать в кеше метаданных
+    METADATA_CACHE_SIZE = 256
+    
     def __init__(self, ffprobe_path: str = "ffprobe", ffmpeg_path: str = "ffmpeg"):
         self.ffprobe_path = ffprobe_path
         self.ffmpeg_path = ffmpeg_path
+        # LRU-кеш метаданных по (путь, mtime_ns, размер): повторные проверки
+        # неизмененного файла не запускают ffprobe заново
+        self._metadata_cache: "OrderedDict[Tuple[str, int, int], Dict]" = OrderedDict()
+        self._metadata_lock = threading.Lock()
         
     def check_video_integrity(self, file_path: Path) -> VideoIntegrityInfo:
         """Комплексная проверка целостности видеофайла"""
         
-        info = VideoIntegrityInfo(
-            status=VideoIntegrityStatus.UNKNOWN,
-            file_size=file_path.stat().st_size if file_path.exists() else 0
-        )
+        info = VideoIntegrityInfo(status=VideoIntegrityStatus.UNKNOWN)
         
-        if not file_path.exists():
+        # Один stat вместо exists() + stat() + exists()
+        try:
+            info.file_size = os.stat(file_path).st_size
+        except OSError:
             info.status = VideoIntegrityStatus.UNREADABLE
             info.error_message = "File does not exist"
             return info
@@ -84,7 +94,34 @@ class VideoIntegrityChecker:
         return info
     
     def _check_metadata(self, file_path: Path) -> Optional[Dict]:
-        """Получение базовых метаданных файла"""
+        """Получение базовых метаданных файла (с кешированием по mtime и размеру)"""
+        try:
+            stat = file_path.stat()
+        except OSError as e:
+            logger.debug("Cannot stat %s: %s", file_path, e)
+            return None
+            
+        key = (str(file_path), stat.st_mtime_ns, stat.st_size)
+        with self._metadata_lock:
+            cached = self._metadata_cache.get(key)
+            if cached is not None:
+                self._metadata_cache.move_to_end(key)
+                return dict(cached)
+                
+        metadata = self._probe_metadata(file_path)
+        
+        # Кешируем только успешные результаты: сбой ffprobe может быть временным
+        if metadata is not None:
+            with self._metadata_lock:
+                self._metadata_cache[key] = metadata
+                if len(self._metadata_cache) > self.METADATA_CACHE_SIZE:
+                    self._metadata_cache.popitem(last=False)
+            return dict(metadata)
+            
+        return None
+    
+    def _probe_metadata(self, file_path: Path) -> Optional[Dict]:
+        """Запуск ffprobe для получения метаданных файла"""
         try:
             cmd = [
                 self.ffprobe_path,
@@ -103,15 +140,17 @@ class VideoIntegrityChecker:
             )
             
             if result.returncode != 0:
-                logger.debug(f"FFprobe failed for {file_path}: {result.stderr}")
+                logger.debug("FFprobe failed for %s: %s", file_path, result.stderr)
                 return None
                 
             data = json.loads(result.stdout)
             
-            # Извлекаем информацию о видеопотоке
+            # Извлекаем информацию о видеопотоке (обложки MP4/M4V - тоже
+            # video-потоки, но с disposition.attached_pic, их пропускаем)
             video_stream = None
             for stream in data.get('streams', []):
-                if stream.get('codec_type') == 'video':
+                if (stream.get('codec_type') == 'video' and
+                        not stream.get('disposition', {}).get('attached_pic')):
                     video_stream = stream
                     break
                     
@@ -137,7 +176,7 @@ class VideoIntegrityChecker:
             }
             
         except Exception as e:
-            logger.debug(f"Error checking metadata for {file_path}: {e}")
+            logger.debug("Error checking metadata for %s: %s", file_path, e)
             return None
     
     def _check_readable_duration(self, file_path: Path) -> Optional[float]:
@@ -174,7 +213,7 @@ class VideoIntegrityChecker:
             return None
             
         except Exception as e:
-            logger.debug(f"Error checking readable duration for {file_path}: {e}")
+            logger.debug("Error checking readable duration for %s: %s", file_path, e)
             return None
     
     def _find_readable_end(self, file_path: Path) -> Optional[float]:
@@ -217,7 +256,7 @@ class VideoIntegrityChecker:
                 return min(mid_point, total_duration * 0.3)
                 
         except Exception as e:
-            logger.debug(f"Error finding readable end for {file_path}: {e}")
+            logger.debug("Error finding readable end for %s: %s", file_path, e)
             return None
     
     def _analyze_integrity(self, info: VideoIntegrityInfo) -> VideoIntegrityStatus:
@@ -261,12 +300,16 @@ class VideoIntegrityChecker:
             if not duration or duration < 60:  # Слишком короткий файл
                 return False
                 
-            # Проверяем последние 10 секунд файла
+            # Проверяем последние 10 секунд файла.
+            # Декодируем только первый настоящий видеопоток (он гарантирован
+            # проверкой метаданных) - аудио и субтитры для быстрой проверки не
+            # нужны. Заглавная V пропускает обложки (attached_pic)
             cmd = [
                 self.ffmpeg_path,
                 '-v', 'error',
                 '-ss', str(duration - 10),
                 '-i', str(file_path),
+                '-map', '0:V:0',
                 '-t', '5',
                 '-f', 'null',
                 '-'
@@ -282,7 +325,7 @@ class VideoIntegrityChecker:
             return result.returncode == 0
             
         except Exception as e:
-            logger.debug(f"Error in quick integrity check for {file_path}: {e}")
+            logger.debug("Error in quick integrity check for %s: %s", file_path, e)
             return False
     
     def is_video_complete(self, file_path: Path) -> Tuple[bool, str]:
@@ -315,12 +358,16 @@ class VideoIntegrityChecker:
 
 # Глобальный экземпляр для удобства использования
 _global_checker = None
+_global_checker_lock = threading.Lock()
 
 def get_video_checker() -> VideoIntegrityChecker:
     """Получить глобальный экземпляр проверки видео"""
     global _global_checker
+    # Двойная проверка: блокировка нужна только при первом создании
     if _global_checker is None:
-        _global_checker = VideoIntegrityChecker()
+        with _global_checker_lock:
+            if _global_checker is None:
+                _global_checker = VideoIntegrityChecker()
     return _global_checker
 
 def is_video_file_complete(file_path: Path) -> Tuple[bool, str]:
@@ -1,4 +1,5 @@
 import asyncio
+import time
 from .config_manager import ConfigManager
 from .audio_monitor import AudioMonitor
 
@@ -35,7 +36,6 @@ class AudioMonitorService(win32serviceutil.ServiceFramework):
             self.monitor.stop()
 
         # Даем время на корректное завершение
-        import time
         time.sleep(2)
 
         if self.loop and self.loop.is_running():
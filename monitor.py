@@ -44,12 +44,19 @@ async def main():
     monitor = AudioMonitor(config)
 
     # Обработка сигналов для корректной остановки
-    def signal_handler(sig, frame):
+    def signal_handler(sig, frame=None):
         logger.info(f"Получен сигнал остановки: {sig}")
         monitor.stop()
 
-    signal.signal(signal.SIGINT, signal_handler)
-    signal.signal(signal.SIGTERM, signal_handler)
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            # Обработчик выполняется в самом event loop, а не прерывает
+            # произвольный байткод
+            loop.add_signal_handler(sig, signal_handler, sig)
+        except NotImplementedError:
+            # Windows: loop.add_signal_handler не поддерживается
+            signal.signal(sig, signal_handler)
 
     # Запускаем мониторинг
     try: